@@ -68,6 +68,31 @@ class _CaseInsensitiveString(str):
 _strI = _CaseInsensitiveString
 
 
+# Field names repeat in every paragraph of a Packages or Sources file, so
+# Deb822Dict reuses one _strI per exact spelling.  Dict lookups with the same
+# object then succeed on identity without calling the Python-level __eq__.
+# The cache is keyed on the exact (case-sensitive) str so that the original
+# case of each spelling is preserved (see #473254).
+_strI_cache = {}  # type: Dict[str, _CaseInsensitiveString]
+_STRI_CACHE_SIZE = 1024
+
+
+def _cached_strI(str_):
+    # type: (str) -> _CaseInsensitiveString
+    """Returns a _strI for str_, reusing a previous one if possible."""
+    if type(str_) is not str:  # pylint: disable=unidiomatic-typecheck
+        # Other str subclasses (including _strI itself) compare equal to
+        # differently-cased keys, so they must not be used for the lookup.
+        return _strI(str_)
+    try:
+        return _strI_cache[str_]
+    except KeyError:
+        if len(_strI_cache) >= _STRI_CACHE_SIZE:
+            _strI_cache.clear()
+        s = _strI_cache[str_] = _strI(str_)
+        return s
+
+
 def default_field_sort_key(x):
     # type: (str) -> Any
     return x.lower()
@@ -308,7 +308,7 @@ except ImportError:
 # pylint: disable=useless-import-alias
 from debian._util import (
     OrderedSet as OrderedSet,
-    _CaseInsensitiveString, _strI,
+    _CaseInsensitiveString, _cached_strI,
     default_field_sort_key,
 )
 from debian.deprecation import function_deprecated_by
@@ -424,7 +424,8 @@ class Deb822Dict(_Deb822Dict_base):
     in the _parsed dictionary are exposed.
     """
 
-    # See the end of the file for the definition of _strI
+    # Keys are stored as case-insensitive strings from _cached_strI() in
+    # debian._util
 
     def __init__(self,
                  _dict=None,    # type: Optional[Union[Deb822Mapping, Iterable[Tuple[str,str]]]]
@@ -463,9 +464,9 @@ class Deb822Dict(_Deb822Dict_base):
         if _parsed is not None:
             self.__parsed = _parsed
             if _fields is None:
-                self.__keys.extend([_strI(k) for k in self.__parsed])
+                self.__keys.extend([_cached_strI(k) for k in self.__parsed])
             else:
-                self.__keys.extend([_strI(f) for f in _fields if f in self.__parsed])
+                self.__keys.extend([_cached_strI(f) for f in _fields if f in self.__parsed])
 
     # ### BEGIN collections.abc.MutableMapping methods
 
@@ -480,13 +481,13 @@ class Deb822Dict(_Deb822Dict_base):
 
     def __setitem__(self, key, value):
         # type: (str, Deb822ValueType) -> None
-        keyi = _strI(key)
+        keyi = _cached_strI(key)
         self.__keys.add(keyi)
         self.__dict[keyi] = value
 
     def __getitem__(self, key):
         # type: (str) -> Deb822ValueType
-        keyi = _strI(key)
+        keyi = _cached_strI(key)
         try:
             value = self.__dict[keyi]
         except KeyError:
@@ -504,7 +505,7 @@ class Deb822Dict(_Deb822Dict_base):
 
     def __delitem__(self, key):
         # type: (str) -> None
-        keyi = _strI(key)
+        keyi = _cached_strI(key)
         self.__keys.remove(keyi)
         try:
             del self.__dict[keyi]
@@ -515,7 +516,7 @@ class Deb822Dict(_Deb822Dict_base):
 
     def __contains__(self, key):
         # type: (Any) -> bool
-        keyi = _strI(key)
+        keyi = _cached_strI(key)
         return keyi in self.__keys
 
     # ### END collections.abc.MutableMapping methods
@@ -523,19 +524,19 @@ class Deb822Dict(_Deb822Dict_base):
     def order_last(self, field):
         # type: (str) -> None
         """Re-order the given field so it is "last" in the paragraph"""
-        self.__keys.order_last(_strI(field))
+        self.__keys.order_last(_cached_strI(field))
 
     def order_first(self, field):
         # type: (str) -> None
         """Re-order the given field so it is "first" in the paragraph"""
-        self.__keys.order_first(_strI(field))
+        self.__keys.order_first(_cached_strI(field))
 
     def order_before(self, field, reference_field):
         # type: (str, str) -> None
         """Re-order the given field so appears directly after the reference field in the paragraph
 
         The reference field must be present."""
-        self.__keys.order_before(_strI(field), _strI(reference_field))
+        self.__keys.order_before(_cached_strI(field), _cached_strI(reference_field))
 
     def order_after(self, field, reference_field):
         # type: (str, str) -> None
@@ -543,7 +544,7 @@ class Deb822Dict(_Deb822Dict_base):
 
         The reference field must be present.
         """
-        self.__keys.order_after(_strI(field), _strI(reference_field))
+        self.__keys.order_after(_cached_strI(field), _cached_strI(reference_field))
 
     def sort_fields(self, key=None):
         # type: (Optional[Callable[[str], Any]]) -> None
@@ -808,45 +809,55 @@ class Deb822(Deb822Dict):
             sequence = sequence.splitlines()
 
         curkey = None
-        content = ""
+        # The lines of the current field's value, joined when it is stored
+        content = []  # type: List[str]
 
         for linebytes in self.gpg_stripped_paragraph(
                 self._skip_useless_lines(sequence), strict):
+            if curkey is None and linebytes.startswith((b' ', b'\t')):
+                # Continuation of a field that is not wanted; its value is
+                # never stored, so don't spend time decoding it.
+                continue
+
             line = self.decoder.decode(linebytes)
 
-            m = self._single.match(line)
-            if m:
-                if curkey:
-                    self[curkey] = content
+            # Continuation lines are the most common kind in large paragraphs
+            # (Description, Files, ...); a leading space or tab can never
+            # start a field, so don't bother trying _single and _multi.
+            if not line.startswith((' ', '\t')):
+                m = self._single.match(line)
+                if m:
+                    if curkey:
+                        self[curkey] = '\n'.join(content)
+
+                    if not wanted_field(m.group('key')):
+                        curkey = None
+                        continue
 
-                if not wanted_field(m.group('key')):
-                    curkey = None
+                    curkey = m.group('key')
+                    content = [m.group('data')]
                     continue
 
-                curkey = m.group('key')
-                content = m.group('data')
-                continue
+                m = self._multi.match(line)
+                if m:
+                    if curkey:
+                        self[curkey] = '\n'.join(content)
 
-            m = self._multi.match(line)
-            if m:
-                if curkey:
-                    self[curkey] = content
+                    if not wanted_field(m.group('key')):
+                        curkey = None
+                        continue
 
-                if not wanted_field(m.group('key')):
-                    curkey = None
+                    curkey = m.group('key')
+                    content = [""]
                     continue
 
-                curkey = m.group('key')
-                content = ""
-                continue
-
             m = self._multidata.match(line)
             if m:
-                content += '\n' + line   # XXX not m.group('data')?
+                content.append(line)   # XXX not m.group('data')?
                 continue
 
         if curkey:
-            self[curkey] = content
+            self[curkey] = '\n'.join(content)
 
     def __str__(self):
         # type: () -> str
@@ -898,15 +909,13 @@ class Deb822(Deb822Dict):
                    encoding,         # type: str
                    ):
         # type: (...) -> None
-        for entry in self._dump_format():
-            fd.write(entry.encode(encoding))
+        fd.write(self._dump_str().encode(encoding))
 
     def _dump_fd_t(self,
                    fd,               # type: IO[str]
                    ):
         # type: (...) -> None
-        for entry in self._dump_format():
-            fd.write(entry)
+        fd.write(self._dump_str())
 
     @overload
     def dump(self):
@@ -1126,10 +1135,12 @@ class Deb822(Deb822Dict):
 
         # Include whitespace-only lines in blank lines to split paragraphs.
         # (see #715558)
-        if strict.get('whitespace-separates-paragraphs', True):
-            blank_line = Deb822._blank_line_whitespace
-        else:
-            blank_line = Deb822._blank_line_no_whitespace
+        # These checks run for every input line, so they use bytes methods
+        # equivalent to _blank_line_whitespace/_blank_line_no_whitespace and
+        # only try _gpgre on lines that can be armor lines.
+        whitespace_is_blank = strict.get('whitespace-separates-paragraphs',
+                                         True)
+        gpgre_match = Deb822._gpgre.match
         first_line = True
 
         for line_ in sequence:
@@ -1146,15 +1157,20 @@ class Deb822(Deb822Dict):
 
             # skip initial blank lines, if any
             if first_line:
-                if Deb822._initial_blank_line.match(line):
+                if not line.strip():
                     continue
                 first_line = False
 
-            m = Deb822._gpgre.match(line)
+            if whitespace_is_blank:
+                is_blank = not line.strip()
+            else:
+                is_blank = not line
+
+            m = gpgre_match(line) if line.startswith(b'-----') else None
 
             if not m:
                 if state == b'SAFE':
-                    if not blank_line.match(line):
+                    if not is_blank:
                         lines.append(line)
                     else:
                         if not gpg_pre_lines:
@@ -1162,7 +1178,7 @@ class Deb822(Deb822Dict):
                             # this blank line
                             break
                 elif state == b'SIGNED MESSAGE':
-                    if blank_line.match(line):
+                    if is_blank:
                         state = b'SAFE'
                     else:
                         gpg_pre_lines.append(line)
@@ -1174,7 +1190,7 @@ class Deb822(Deb822Dict):
                 elif m.group('action') == b'END':
                     gpg_post_lines.append(line)
                     break
-                if not blank_line.match(line):
+                if not is_blank:
                     if not lines:
                         gpg_pre_lines.append(line)
                     else:
@@ -2532,27 +2548,30 @@ class RestrictedWrapper(metaclass=_ClassInitMeta):
 
     @classmethod
     def __init_restricted_field(cls, attr_name, field):  # type: ignore
+        # Unpack the field once here rather than on every property access.
+        name, from_str, to_str, allow_none = field
+
         def getter(self):
             # type: (RestrictedWrapper) -> Deb822ValueType
-            val = self.__data.get(field.name)
-            if field.from_str is not None:
-                return field.from_str(val)
+            val = self.__data.get(name)
+            if from_str is not None:
+                return from_str(val)
             return val
 
         def setter(self, val):
             # type: (RestrictedWrapper, Deb822ValueType) -> None
-            if val is not None and field.to_str is not None:
-                val = field.to_str(val)
+            if val is not None and to_str is not None:
+                val = to_str(val)
             if val is None:
-                if field.allow_none:
-                    if field.name in self.__data:
-                        del self.__data[field.name]
+                if allow_none:
+                    if name in self.__data:
+                        del self.__data[name]
                 else:
                     raise TypeError('value must not be None')
             else:
-                self.__data[field.name] = val
+                self.__data[name] = val
 
-        setattr(cls, attr_name, property(getter, setter, None, field.name))
+        setattr(cls, attr_name, property(getter, setter, None, name))
 
     def __init__(self, data):
         # type: (Deb822) -> None
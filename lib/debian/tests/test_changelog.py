@@ -24,7 +24,10 @@
 # Copyright 2005 Frank Lichtenheld <frank@lichtenheld.de>
 # and licensed under the same license as above.
 
+import functools
+import io
 import os.path
+import pathlib
 import unittest
 import warnings
 
@@ -36,9 +39,12 @@ try:
     # pylint: disable=unused-import
     from typing import (
         Any,
+        Callable,
         IO,
+        List,
         Optional,
         Text,
+        Tuple,
     )
 except ImportError:
     # Missing types aren't important at runtime
@@ -51,34 +57,27 @@ def find_test_file(filename):
     return os.path.join(os.path.dirname(__file__), filename)
 
 
+@functools.lru_cache(maxsize=None)
+def read_test_file_bytes(filename):
+    # type: (str) -> bytes
+    """ read (and cache) the raw contents of a test file """
+    return pathlib.Path(find_test_file(filename)).read_bytes()
+
+
+def read_test_file(filename):
+    # type: (str) -> str
+    """ read the contents of a UTF-8 encoded test file """
+    return read_test_file_bytes(filename).decode('utf-8')
+
+
 def open_utf8(filename, mode='r'):
     # type: (str, str) -> IO[Text]
     """Open a UTF-8 text file in text mode."""
     return open(filename, mode=mode, encoding='UTF-8')
 
 
-class ChangelogTests(unittest.TestCase):
-
-    def test_create_changelog(self):
-        # type: () -> None
-        with open(find_test_file('test_changelog')) as f:
-            c = f.read()
-        cl = changelog.Changelog(c)
-        cs = str(cl)
-        clines = c.split('\n')
-        cslines = cs.split('\n')
-        for i in range(len(clines)):
-            self.assertEqual(clines[i], cslines[i])
-        self.assertEqual(len(clines), len(cslines), "Different lengths")
-
-    def test_create_changelog_single_block(self):
-        # type: () -> None
-        with open(find_test_file('test_changelog')) as f:
-            c = f.read()
-        cl = changelog.Changelog(c, max_blocks=1)
-        cs = str(cl)
-        self.assertEqual(cs,
-        """gnutls13 (1:1.4.1-1) unstable; urgency=HIGH
+# the first block of test_changelog
+SINGLE_BLOCK_CHANGELOG = """gnutls13 (1:1.4.1-1) unstable; urgency=HIGH
 
   [ James Westby ]
   * New upstream release. Closes: #123, #456,
@@ -93,13 +92,27 @@ class ChangelogTests(unittest.TestCase):
 
  -- Andreas Metzler <ametzler@debian.org>  Sat, 15 Jul 2006 11:11:08 +0200
 
-""")
+"""
 
-    def test_modify_changelog(self):
-        # type: () -> None
-        with open(find_test_file('test_modify_changelog1')) as f:
-            c = f.read()
-        cl = changelog.Changelog(c)
+# test_changelog_unicode
+UNICODE_CHANGELOG = """haskell-src-exts (1.8.2-3) unstable; urgency=low
+
+  * control: Use versioned Replaces: and Conflicts:
+
+ -- Marco T\xfalio Gontijo e Silva <marcot@debian.org>  Wed, 05 May 2010 18:01:53 -0300
+
+haskell-src-exts (1.8.2-2) unstable; urgency=low
+
+  * debian/control: Rename -doc package.
+
+ -- Marco T\xfalio Gontijo e Silva <marcot@debian.org>  Tue, 16 Mar 2010 10:59:48 -0300
+"""
+
+
+class ChangelogTests(unittest.TestCase):
+
+    def _modify_changelog(self, cl):
+        # type: (changelog.Changelog) -> None
         cl.package = 'gnutls14'
         cl.version = '1:1.4.1-2'
         cl.distributions = 'experimental'
@@ -107,33 +120,9 @@ class ChangelogTests(unittest.TestCase):
         cl.add_change('  * Add magic foo')
         cl.author = 'James Westby <jw+debian@jameswestby.net>'
         cl.date = 'Sat, 16 Jul 2008 11:11:08 -0200'
-        with open(find_test_file('test_modify_changelog2')) as f:
-            c = f.read()
-        clines = c.split('\n')
-        cslines = str(cl).split('\n')
-        for i in range(len(clines)):
-            self.assertEqual(clines[i], cslines[i])
-        self.assertEqual(len(clines), len(cslines), "Different lengths")
-
-    def test_preserve_initial_lines(self):
-        # type: () -> None
-        cl_text = b"""
-THIS IS A LINE THAT SHOULD BE PRESERVED BUT IGNORED
-haskell-src-exts (1.8.2-3) unstable; urgency=low
-
-  * control: Use versioned Replaces: and Conflicts:
-
- -- Somebody <nobody@debian.org>  Wed, 05 May 2010 18:01:53 -0300
-"""
-        with self.assertWarns(UserWarning):
-            cl = changelog.Changelog(cl_text)
-        self.assertEqual(cl_text, bytes(cl))
 
-    def test_add_changelog_section(self):
-        # type: () -> None
-        with open(find_test_file('test_modify_changelog2')) as f:
-            c = f.read()
-        cl = changelog.Changelog(c)
+    def _add_changelog_section(self, cl):
+        # type: (changelog.Changelog) -> None
         cl.new_block(package='gnutls14',
                 version=debian_support.Version('1:1.4.1-3'),
                 distributions='experimental',
@@ -147,28 +136,56 @@ haskell-src-exts (1.8.2-3) unstable; urgency=low
         cl.add_change('  * Foo did not work, let us try bar')
         cl.add_change('')
 
-        f = open(find_test_file('test_modify_changelog3'))
-        c = f.read()
-        f.close()
-        clines = c.split('\n')
-        cslines = str(cl).split('\n')
-        for i in range(len(clines)):
-            self.assertEqual(clines[i], cslines[i])
-        self.assertEqual(len(clines), len(cslines), "Different lengths")
+    def test_changelog_files(self):
+        # type: () -> None
+        """ parse, optionally modify and format changelogs from test files """
+        cases = [
+            # create
+            ('test_changelog', 'test_changelog', None),
+            # modify
+            ('test_modify_changelog1', 'test_modify_changelog2',
+             self._modify_changelog),
+            # add a section
+            ('test_modify_changelog2', 'test_modify_changelog3',
+             self._add_changelog_section),
+        ]
+        for in_file, expected_file, mutator in cases:
+            with self.subTest(in_file=in_file, expected_file=expected_file):
+                cl = changelog.Changelog(read_test_file_bytes(in_file))
+                if mutator is not None:
+                    mutator(cl)
+                self.assertEqual(bytes(cl), read_test_file_bytes(expected_file))
+
+    def test_create_changelog_single_block(self):
+        # type: () -> None
+        cl = changelog.Changelog(read_test_file('test_changelog'), max_blocks=1)
+        cs = str(cl)
+        self.assertEqual(cs, SINGLE_BLOCK_CHANGELOG)
+
+    def test_preserve_initial_lines(self):
+        # type: () -> None
+        cl_text = b"""
+THIS IS A LINE THAT SHOULD BE PRESERVED BUT IGNORED
+haskell-src-exts (1.8.2-3) unstable; urgency=low
+
+  * control: Use versioned Replaces: and Conflicts:
+
+ -- Somebody <nobody@debian.org>  Wed, 05 May 2010 18:01:53 -0300
+"""
+        with self.assertWarns(UserWarning):
+            cl = changelog.Changelog(cl_text)
+        self.assertEqual(cl_text, bytes(cl))
 
     def test_strange_changelogs(self):
         # type: () -> None
         """ Just opens and parses a strange changelog """
-        with open(find_test_file('test_strange_changelog')) as f:
-            c = f.read()
-        cl = changelog.Changelog(c)
+        cl = changelog.Changelog(read_test_file('test_strange_changelog'))
 
     def test_set_version_with_string(self):
         # type: () -> None
-        with open(find_test_file('test_modify_changelog1')) as f:
-            c1 = changelog.Changelog(f.read())
-            f.seek(0)
-            c2 = changelog.Changelog(f.read())
+        cl_data = read_test_file('test_modify_changelog1')
+        c1 = changelog.Changelog(cl_data)
+        c2 = changelog.Changelog(cl_data)
         c1.version = '1:2.3.5-2'
         c2.version = debian_support.Version('1:2.3.5-2')
         self.assertEqual(c1.version, c2.version)
@@ -197,8 +214,7 @@ haskell-src-exts (1.8.2-3) unstable; urgency=low
 
     def test_magic_version_properties(self):
         # type: () -> None
-        with open(find_test_file('test_changelog')) as f:
-            c = changelog.Changelog(f)
+        c = changelog.Changelog(read_test_file('test_changelog'))
         self.assertEqual(c.debian_version, '1')
         self.assertEqual(c.full_version, '1:1.4.1-1')
         self.assertEqual(c.upstream_version, '1.4.1')
@@ -207,21 +223,22 @@ haskell-src-exts (1.8.2-3) unstable; urgency=low
 
     def test_bugs_closed(self):
         # type: () -> None
-        with open(find_test_file('test_changelog')) as f:
-            c = iter(changelog.Changelog(f))
-        # test bugs in a list
-        block = next(c)
-        self.assertEqual(block.bugs_closed, [123, 456, 789])
-        self.assertEqual(block.lp_bugs_closed, [1234, 2345, 3456])
-        # test bugs in parentheses
-        block = next(c)
-        self.assertEqual(block.bugs_closed, [375815])
-        self.assertEqual(block.lp_bugs_closed, [])
+        cases = [
+            # bugs in a list
+            (0, [123, 456, 789], [1234, 2345, 3456]),
+            # bugs in parentheses
+            (1, [375815], []),
+        ]
+        c = changelog.Changelog(read_test_file('test_changelog'))
+        for index, bugs, lp_bugs in cases:
+            with self.subTest(block=index):
+                block = c[index]
+                self.assertEqual(block.bugs_closed, bugs)
+                self.assertEqual(block.lp_bugs_closed, lp_bugs)
 
     def test_allow_full_stops_in_distribution(self):
         # type: () -> None
-        with open(find_test_file('test_changelog_full_stops')) as f:
-            c = changelog.Changelog(f)
+        c = changelog.Changelog(read_test_file('test_changelog_full_stops'))
         self.assertEqual(c.debian_version, None)
         self.assertEqual(c.full_version, '1.2.3')
         self.assertEqual(str(c.version), c.full_version)
@@ -231,57 +248,48 @@ haskell-src-exts (1.8.2-3) unstable; urgency=low
         # The parsing of the changelog (including the string representation)
         # should be consistent whether we give a single string, a list of
         # lines, or a file object to the Changelog initializer
-        with open(find_test_file('test_changelog')) as f:
-            cl_data = f.read()
-            f.seek(0)
-            c1 = changelog.Changelog(f)
-        c2 = changelog.Changelog(cl_data)
-        c3 = changelog.Changelog(cl_data.splitlines())
-        for c in (c1, c2, c3):
-            self.assertEqual(str(c), cl_data)
-
-    def test_utf8_encoded_file_input(self):
+        cl_data = read_test_file('test_changelog')
+        cl_bytes = read_test_file_bytes('test_changelog')
+        cases = [
+            ('file', lambda: changelog.Changelog(io.StringIO(cl_data))),
+            ('str', lambda: changelog.Changelog(cl_data)),
+            ('lines', lambda: changelog.Changelog(cl_data.splitlines())),
+            ('bytes', lambda: changelog.Changelog(cl_bytes)),
+        ]  # type: List[Tuple[str, Callable[[], changelog.Changelog]]]
+        for shape, parse in cases:
+            with self.subTest(shape=shape):
+                c = parse()
+                self.assertEqual(str(c), cl_data)
+                self.assertEqual(bytes(c), cl_bytes)
+
+    def test_encoding_roundtrip(self):
         # type: () -> None
-        f = open_utf8(find_test_file('test_changelog_unicode'))
-        c = changelog.Changelog(f)
-        f.close()
-        u = str(c)
-        expected_u = """haskell-src-exts (1.8.2-3) unstable; urgency=low
-
-  * control: Use versioned Replaces: and Conflicts:
-
- -- Marco T\xfalio Gontijo e Silva <marcot@debian.org>  Wed, 05 May 2010 18:01:53 -0300
-
-haskell-src-exts (1.8.2-2) unstable; urgency=low
-
-  * debian/control: Rename -doc package.
-
- -- Marco T\xfalio Gontijo e Silva <marcot@debian.org>  Tue, 16 Mar 2010 10:59:48 -0300
-"""
-        self.assertEqual(u, expected_u)
-        self.assertEqual(bytes(c), u.encode('utf-8'))
-
-    def test_unicode_object_input(self):
-        # type: () -> None
-        with open(find_test_file('test_changelog_unicode'), 'rb') as f:
-            c_bytes = f.read()
-        c_unicode = c_bytes.decode('utf-8')
-        c = changelog.Changelog(c_unicode)
-        self.assertEqual(str(c), c_unicode)
-        self.assertEqual(bytes(c), c_bytes)
-
-    def test_non_utf8_encoding(self):
-        # type: () -> None
-        with open(find_test_file('test_changelog_unicode'), 'rb') as f:
-            c_bytes = f.read()
+        """ parse and format a non-ASCII changelog in different encodings """
+        c_bytes = read_test_file_bytes('test_changelog_unicode')
         c_unicode = c_bytes.decode('utf-8')
         c_latin1_str = c_unicode.encode('latin1')
-        c = changelog.Changelog(c_latin1_str, encoding='latin1')
-        self.assertEqual(str(c), c_unicode)
-        self.assertEqual(bytes(c), c_latin1_str)
-        for block in c:
-            self.assertEqual(bytes(block),
-                             str(block).encode('latin1'))
+
+        def from_utf8_file():
+            # type: () -> changelog.Changelog
+            with open_utf8(find_test_file('test_changelog_unicode')) as f:
+                return changelog.Changelog(f)
+
+        cases = [
+            ('utf-8 file', from_utf8_file, 'utf-8', c_bytes),
+            ('unicode object', lambda: changelog.Changelog(c_unicode),
+             'utf-8', c_bytes),
+            ('latin1 bytes',
+             lambda: changelog.Changelog(c_latin1_str, encoding='latin1'),
+             'latin1', c_latin1_str),
+        ]
+        for input_type, parse, encoding, expected_bytes in cases:
+            with self.subTest(input_type=input_type):
+                c = parse()
+                self.assertEqual(str(c), UNICODE_CHANGELOG)
+                self.assertEqual(bytes(c), expected_bytes)
+                # the blocks are all created with the same encoding
+                block = c[0]
+                self.assertEqual(bytes(block), str(block).encode(encoding))
 
     def test_malformed_date(self):
         # type: () -> None
@@ -301,15 +309,15 @@ haskell-src-exts (1.8.2-2) unstable; urgency=low
 
     def test_block_iterator(self):
         # type: () -> None
-        with open(find_test_file('test_changelog')) as f:
-            c = changelog.Changelog(f)
-        self.assertEqual([str(b) for b in c._blocks], [str(b) for b in c])
+        c = changelog.Changelog(read_test_file('test_changelog'))
+        # ChangeBlock has no __eq__, so this checks that iteration yields the
+        # stored blocks themselves without formatting each of them twice
+        self.assertEqual(list(c), c._blocks)
 
     def test_block_access(self):
         # type: () -> None
         """ test random access to changelog entries """
-        with open(find_test_file('test_changelog')) as f:
-            c = changelog.Changelog(f)
+        c = changelog.Changelog(read_test_file('test_changelog'))
         self.assertEqual(str(c[2].version), '1.4.0-2',
                          'access by sequence number')
         self.assertEqual(str(c['1.4.0-1'].version), '1.4.0-1',
@@ -320,8 +328,7 @@ haskell-src-exts (1.8.2-2) unstable; urgency=low
 
     def test_len(self):
         # type: () -> None
-        with open(find_test_file('test_changelog')) as f:
-            c = changelog.Changelog(f)
+        c = changelog.Changelog(read_test_file('test_changelog'))
         self.assertEqual(len(c._blocks), len(c))
 
 
@@ -30,9 +30,11 @@ try:
     from typing import (
         Any,
         List,
+        Optional,
         Pattern,
         Sequence,
         Text,
+        Tuple,
         TYPE_CHECKING,
     )
 except ImportError:
@@ -80,6 +82,8 @@ License: GPL-2+
  [LICENSE TEXT]
 """
 
+SIMPLE_LINES = tuple(SIMPLE.splitlines())
+
 GPL_TWO_PLUS_TEXT = """\
 This program is free software; you can redistribute it
 and/or modify it under the terms of the GNU General Public
@@ -133,6 +137,9 @@ License: 123
 
 FORMAT = 'https://www.debian.org/doc/packaging-manuals/copyright-format/1.0/'
 
+ISC = copyright.License('ISC')
+APACHE = copyright.License('Apache')
+
 
 class LineBasedTest(unittest.TestCase):
     """Test for _LineBased.{to,from}_str"""
@@ -142,90 +149,66 @@ class LineBasedTest(unittest.TestCase):
         # Alias for less typing.
         self.lb = copyright._LineBased
 
-    def test_from_str_none(self):
-        # type: () -> None
-        self.assertEqual((), self.lb.from_str(None))
-
-    def test_from_str_empty(self):
-        # type: () -> None
-        self.assertEqual((), self.lb.from_str(''))
-
-    def test_from_str_single_line(self):
-        # type: () -> None
-        self.assertEqual(
-            ('Foo Bar <foo@bar.com>',),
-            self.lb.from_str('Foo Bar <foo@bar.com>'))
-
-    def test_from_str_single_value_after_newline(self):
-        # type: () -> None
-        self.assertEqual(
-            ('Foo Bar <foo@bar.com>',),
-            self.lb.from_str('\n Foo Bar <foo@bar.com>'))
-
-    def test_from_str_multiline(self):
-        # type: () -> None
-        self.assertEqual(
-            ('Foo Bar <foo@bar.com>', 'http://bar.com/foo'),
-            self.lb.from_str('\n Foo Bar <foo@bar.com>\n http://bar.com/foo'))
-
-    def test_to_str_empty(self):
-        # type: () -> None
-        self.assertIsNone(self.lb.to_str([]))
-        self.assertIsNone(self.lb.to_str(()))
-
-    def test_to_str_single(self):
-        # type: () -> None
-        self.assertEqual(
-            'Foo Bar <foo@bar.com>',
-            self.lb.to_str(['Foo Bar <foo@bar.com>']))
-
-    def test_to_str_multi_list(self):
-        # type: () -> None
-        self.assertEqual(
-            '\n Foo Bar <foo@bar.com>\n http://bar.com/foo',
-            self.lb.to_str(
-                ['Foo Bar <foo@bar.com>', 'http://bar.com/foo']))
-
-    def test_to_str_multi_tuple(self):
-        # type: () -> None
-        self.assertEqual(
-            '\n Foo Bar <foo@bar.com>\n http://bar.com/foo',
-            self.lb.to_str(
-                ('Foo Bar <foo@bar.com>', 'http://bar.com/foo')))
-
-    def test_to_str_empty_value(self):
-        # type: () -> None
-        with self.assertRaises(ValueError) as cm:
-            self.lb.to_str(['foo', '', 'bar'])
-        self.assertEqual(('values must not be empty',), cm.exception.args)
-
-    def test_to_str_whitespace_only_value(self):
-        # type: () -> None
-        with self.assertRaises(ValueError) as cm:
-            self.lb.to_str(['foo', ' \t', 'bar'])
-        self.assertEqual(('values must not be empty',), cm.exception.args)
-
-    def test_to_str_elements_stripped(self):
-        # type: () -> None
-        self.assertEqual(
-            '\n Foo Bar <foo@bar.com>\n http://bar.com/foo',
-            self.lb.to_str(
-                (' Foo Bar <foo@bar.com>\t', ' http://bar.com/foo  ')))
-
-    def test_to_str_newlines_single(self):
-        # type: () -> None
-        with self.assertRaises(ValueError) as cm:
-            self.lb.to_str([' Foo Bar <foo@bar.com>\n http://bar.com/foo  '])
-        self.assertEqual(
-            ('values must not contain newlines',), cm.exception.args)
-
-    def test_to_str_newlines_multi(self):
-        # type: () -> None
-        with self.assertRaises(ValueError) as cm:
-            self.lb.to_str(
-                ['bar', ' Foo Bar <foo@bar.com>\n http://bar.com/foo  '])
-        self.assertEqual(
-            ('values must not contain newlines',), cm.exception.args)
+    def test_from_str(self):
+        # type: () -> None
+        cases = [
+            # none
+            (None, ()),
+            # empty
+            ('', ()),
+            # single line
+            ('Foo Bar <foo@bar.com>', ('Foo Bar <foo@bar.com>',)),
+            # single value after newline
+            ('\n Foo Bar <foo@bar.com>', ('Foo Bar <foo@bar.com>',)),
+            # multiline
+            ('\n Foo Bar <foo@bar.com>\n http://bar.com/foo',
+             ('Foo Bar <foo@bar.com>', 'http://bar.com/foo')),
+        ]  # type: List[Tuple[Optional[str], Tuple[str, ...]]]
+        for s, expected in cases:
+            with self.subTest(s=s):
+                self.assertEqual(expected, self.lb.from_str(s))
+
+    def test_to_str(self):
+        # type: () -> None
+        cases = [
+            # empty
+            ([], None),
+            ((), None),
+            # single
+            (['Foo Bar <foo@bar.com>'], 'Foo Bar <foo@bar.com>'),
+            # multi list
+            (['Foo Bar <foo@bar.com>', 'http://bar.com/foo'],
+             '\n Foo Bar <foo@bar.com>\n http://bar.com/foo'),
+            # multi tuple
+            (('Foo Bar <foo@bar.com>', 'http://bar.com/foo'),
+             '\n Foo Bar <foo@bar.com>\n http://bar.com/foo'),
+            # elements stripped
+            ((' Foo Bar <foo@bar.com>\t', ' http://bar.com/foo  '),
+             '\n Foo Bar <foo@bar.com>\n http://bar.com/foo'),
+        ]  # type: List[Tuple[Sequence[str], Optional[str]]]
+        for seq, expected in cases:
+            with self.subTest(seq=seq):
+                self.assertEqual(expected, self.lb.to_str(seq))
+
+    def test_to_str_invalid(self):
+        # type: () -> None
+        cases = [
+            # empty value
+            (['foo', '', 'bar'], 'values must not be empty'),
+            # whitespace only value
+            (['foo', ' \t', 'bar'], 'values must not be empty'),
+            # newlines single
+            ([' Foo Bar <foo@bar.com>\n http://bar.com/foo  '],
+             'values must not contain newlines'),
+            # newlines multi
+            (['bar', ' Foo Bar <foo@bar.com>\n http://bar.com/foo  '],
+             'values must not contain newlines'),
+        ]
+        for seq, error in cases:
+            with self.subTest(seq=seq):
+                with self.assertRaises(ValueError) as cm:
+                    self.lb.to_str(seq)
+                self.assertEqual((error,), cm.exception.args)
 
 
 class SpaceSeparatedTest(unittest.TestCase):
@@ -236,65 +219,62 @@ class SpaceSeparatedTest(unittest.TestCase):
         # Alias for less typing.
         self.ss = copyright._SpaceSeparated
 
-    def test_from_str_none(self):
-        # type: () -> None
-        self.assertEqual((), self.ss.from_str(None))
-
-    def test_from_str_empty(self):
-        # type: () -> None
-        self.assertEqual((), self.ss.from_str(' '))
-        self.assertEqual((), self.ss.from_str(''))
-
-    def test_from_str_single(self):
-        # type: () -> None
-        self.assertEqual(('foo',), self.ss.from_str('foo'))
-        self.assertEqual(('bar',), self.ss.from_str(' bar '))
-
-    def test_from_str_multi(self):
-        # type: () -> None
-        self.assertEqual(('foo', 'bar', 'baz'), self.ss.from_str('foo bar baz'))
-        self.assertEqual(
-            ('bar', 'baz', 'quux'), self.ss.from_str(' bar baz quux \t '))
-
-    def test_to_str_empty(self):
-        # type: () -> None
-        self.assertIsNone(self.ss.to_str([]))
-        self.assertIsNone(self.ss.to_str(()))
-
-    def test_to_str_single(self):
-        # type: () -> None
-        self.assertEqual('foo', self.ss.to_str(['foo']))
-
-    def test_to_str_multi(self):
-        # type: () -> None
-        self.assertEqual('foo bar baz', self.ss.to_str(['foo', 'bar', 'baz']))
-
-    def test_to_str_empty_value(self):
-        # type: () -> None
-        with self.assertRaises(ValueError) as cm:
-            self.ss.to_str(['foo', '', 'bar'])
-        self.assertEqual(('values must not be empty',), cm.exception.args)
-
-    def test_to_str_value_has_space_single(self):
-        # type: () -> None
-        with self.assertRaises(ValueError) as cm:
-            self.ss.to_str([' baz quux '])
-        self.assertEqual(
-            ('values must not contain whitespace',), cm.exception.args)
-
-    def test_to_str_value_has_space_multi(self):
-        # type: () -> None
-        with self.assertRaises(ValueError) as cm:
-            self.ss.to_str(['foo', ' baz quux '])
-        self.assertEqual(
-            ('values must not contain whitespace',), cm.exception.args)
+    def test_from_str(self):
+        # type: () -> None
+        cases = [
+            # none
+            (None, ()),
+            # empty
+            (' ', ()),
+            ('', ()),
+            # single
+            ('foo', ('foo',)),
+            (' bar ', ('bar',)),
+            # multi
+            ('foo bar baz', ('foo', 'bar', 'baz')),
+            (' bar baz quux \t ', ('bar', 'baz', 'quux')),
+        ]  # type: List[Tuple[Optional[str], Tuple[str, ...]]]
+        for s, expected in cases:
+            with self.subTest(s=s):
+                self.assertEqual(expected, self.ss.from_str(s))
+
+    def test_to_str(self):
+        # type: () -> None
+        cases = [
+            # empty
+            ([], None),
+            ((), None),
+            # single
+            (['foo'], 'foo'),
+            # multi
+            (['foo', 'bar', 'baz'], 'foo bar baz'),
+        ]  # type: List[Tuple[Sequence[str], Optional[str]]]
+        for seq, expected in cases:
+            with self.subTest(seq=seq):
+                self.assertEqual(expected, self.ss.to_str(seq))
+
+    def test_to_str_invalid(self):
+        # type: () -> None
+        cases = [
+            # empty value
+            (['foo', '', 'bar'], 'values must not be empty'),
+            # value has space single
+            ([' baz quux '], 'values must not contain whitespace'),
+            # value has space multi
+            (['foo', ' baz quux '], 'values must not contain whitespace'),
+        ]
+        for seq, error in cases:
+            with self.subTest(seq=seq):
+                with self.assertRaises(ValueError) as cm:
+                    self.ss.to_str(seq)
+                self.assertEqual((error,), cm.exception.args)
 
 
 class CopyrightTest(unittest.TestCase):
 
     def test_basic_parse_success(self):
         # type: () -> None
-        c = copyright.Copyright(sequence=SIMPLE.splitlines())
+        c = copyright.Copyright(sequence=SIMPLE_LINES)
         self.assertEqual(FORMAT, c.header.format)
         self.assertEqual(FORMAT, c.header['Format'])
         self.assertEqual('X Solitaire', c.header.upstream_name)
@@ -307,23 +287,22 @@ class CopyrightTest(unittest.TestCase):
 
     def test_parse_and_dump(self):
         # type: () -> None
-        c = copyright.Copyright(sequence=SIMPLE.splitlines())
+        c = copyright.Copyright(sequence=SIMPLE)
         dumped = c.dump()
         self.assertEqual(SIMPLE, dumped)
 
     def test_all_paragraphs(self):
         # type: () -> None
-        c = copyright.Copyright(MULTI_LICENSE.splitlines())
-        expected = []  # type: List[copyright.AllParagraphTypes]
-        expected.append(c.header)
-        expected.extend(list(c.all_files_paragraphs()))
-        expected.extend(list(c.all_license_paragraphs()))
+        c = copyright.Copyright(sequence=MULTI_LICENSE)
+        expected = [c.header]  # type: List[copyright.AllParagraphTypes]
+        expected.extend(c.all_files_paragraphs())
+        expected.extend(c.all_license_paragraphs())
         self.assertEqual(expected, list(c.all_paragraphs()))
         self.assertEqual(expected, list(c))
 
     def test_all_files_paragraphs(self):
         # type: () -> None
-        c = copyright.Copyright(sequence=SIMPLE.splitlines())
+        c = copyright.Copyright(sequence=SIMPLE)
         self.assertEqual(
             [('*',), ('debian/*',)],
             [fp.files for fp in c.all_files_paragraphs()])
@@ -333,7 +312,7 @@ class CopyrightTest(unittest.TestCase):
 
     def test_find_files_paragraph(self):
         # type: () -> None
-        c = copyright.Copyright(sequence=SIMPLE.splitlines())
+        c = copyright.Copyright(sequence=SIMPLE)
         paragraphs = list(c.all_files_paragraphs())
 
         self.assertIs(paragraphs[0], c.find_files_paragraph('Makefile'))
@@ -345,9 +324,9 @@ class CopyrightTest(unittest.TestCase):
         # type: () -> None
         c = copyright.Copyright()
         files1 = copyright.FilesParagraph.create(
-            ['foo/*'], 'CompanyA', copyright.License('ISC'))
+            ['foo/*'], 'CompanyA', ISC)
         files2 = copyright.FilesParagraph.create(
-            ['bar/*'], 'CompanyB', copyright.License('Apache'))
+            ['bar/*'], 'CompanyB', APACHE)
         c.add_files_paragraph(files1)
         c.add_files_paragraph(files2)
         self.assertIs(files1, c.find_files_paragraph('foo/bar.cc'))
@@ -355,12 +334,47 @@ class CopyrightTest(unittest.TestCase):
         self.assertIsNone(c.find_files_paragraph('baz/quux.cc'))
         self.assertIsNone(c.find_files_paragraph('Makefile'))
 
+    def test_find_files_paragraph_files_changed(self):
+        # type: () -> None
+        c = copyright.Copyright()
+        files1 = copyright.FilesParagraph.create(
+            ['*'], 'CompanyA', ISC)
+        files2 = copyright.FilesParagraph.create(
+            ['foo/*'], 'CompanyB', APACHE)
+        c.add_files_paragraph(files1)
+        c.add_files_paragraph(files2)
+        self.assertIs(files2, c.find_files_paragraph('foo/bar.cc'))
+        self.assertIs(files1, c.find_files_paragraph('bar/baz.cc'))
+        files2.files = ['bar/*']  # type: ignore
+        self.assertIs(files1, c.find_files_paragraph('foo/bar.cc'))
+        self.assertIs(files2, c.find_files_paragraph('bar/baz.cc'))
+
+    def test_find_files_paragraphs_for(self):
+        # type: () -> None
+        c = copyright.Copyright()
+        filenames = ['foo/bar.cc', 'bar/baz.cc', 'Makefile']
+        self.assertEqual([None, None, None], c.find_files_paragraphs_for(filenames))
+
+        files1 = copyright.FilesParagraph.create(
+            ['foo/*'], 'CompanyA', ISC)
+        files2 = copyright.FilesParagraph.create(
+            ['foo/*', 'bar/*'], 'CompanyB', APACHE)
+        c.add_files_paragraph(files1)
+        c.add_files_paragraph(files2)
+        result = c.find_files_paragraphs_for(iter(filenames))
+        self.assertEqual(len(filenames), len(result))
+        self.assertIs(files2, result[0])
+        self.assertIs(files2, result[1])
+        self.assertIsNone(result[2])
+        self.assertEqual(
+            [c.find_files_paragraph(f) for f in filenames], result)
+
     def test_all_license_paragraphs(self):
         # type: () -> None
-        c = copyright.Copyright(sequence=SIMPLE.splitlines())
+        c = copyright.Copyright(sequence=SIMPLE)
         self.assertEqual([], list(c.all_license_paragraphs()))
 
-        c = copyright.Copyright(MULTI_LICENSE.splitlines())
+        c = copyright.Copyright(MULTI_LICENSE)
         self.assertEqual(
             [copyright.License('ABC', '[ABC TEXT]'),
              copyright.License('123', '[123 TEXT]')],
@@ -376,7 +390,7 @@ class CopyrightTest(unittest.TestCase):
 
     def test_error_on_invalid(self):
         # type: () -> None
-        lic = SIMPLE.splitlines()
+        lic = SIMPLE_LINES
         with self.assertRaises(copyright.MachineReadableFormatError) as cm:
             # missing License field from 1st Files stanza
             c = copyright.Copyright(sequence=lic[0:10])
@@ -396,7 +410,7 @@ class MultlineTest(unittest.TestCase):
 
     def setUp(self):
         # type: () -> None
-        paragraphs = list(deb822.Deb822.iter_paragraphs(SIMPLE.splitlines()))
+        paragraphs = list(deb822.Deb822.iter_paragraphs(SIMPLE_LINES))
         self.formatted = paragraphs[1]['License']
         self.parsed = 'GPL-2+\n' + GPL_TWO_PLUS_TEXT
         self.parsed_lines = self.parsed.splitlines()
@@ -504,9 +518,16 @@ class LicenseTest(unittest.TestCase):
              ' Bang and such.'),
             l.to_str())
 
+    def test_from_str_cached(self):
+        # type: () -> None
+        s = 'GPL-2+\n [LICENSE TEXT]'
+        l = copyright.License.from_str(s)
+        self.assertEqual(copyright.License('GPL-2+', '[LICENSE TEXT]'), l)
+        self.assertIs(l, copyright.License.from_str(s))
+
     def test_typical(self):
         # type: () -> None
-        paragraphs = list(deb822.Deb822.iter_paragraphs(SIMPLE.splitlines()))
+        paragraphs = list(deb822.Deb822.iter_paragraphs(SIMPLE_LINES))
         p = paragraphs[1]
         l = copyright.License.from_str(p['license'])
         if l is not None:
@@ -568,9 +589,27 @@ class LicenseParagraphTest(unittest.TestCase):
 
 class GlobsToReTest(unittest.TestCase):
 
-    def setUp(self):
-        # type: () -> None
-        self.flags = re.MULTILINE | re.DOTALL
+    flags = re.MULTILINE | re.DOTALL
+
+    # expected patterns, compiled once for the class
+    expected_empty = re.compile(r'\Z', flags)
+    expected_star = re.compile(r'.*\Z', flags)
+    expected_star_prefix = re.compile('.*' + re.escape('.in') + r'\Z', flags)
+    expected_star_prefix_with_slash = re.compile(
+        '.*' + re.escape('/Makefile.in') + r'\Z', flags)
+    expected_question_mark = re.compile(
+        re.escape('foo/messages.') + '..' + re.escape('_') + '..' +
+        re.escape('.txt') + r'\Z',
+        flags)
+    expected_multi_literal = re.compile(
+        re.escape('Makefile.in') + '|' + re.escape('foo/bar') + r'\Z', flags)
+    expected_multi_wildcard = re.compile(
+        re.escape('debian/') + '.*|.*' + re.escape('.Debian') + '|' +
+        re.escape('translations/fr_') + '..' + re.escape('/') + r'.*\Z',
+        flags)
+    expected_literal_backslash = re.compile(
+        re.escape(r'foo/bar\baz.c') + '|' + re.escape('bar/quux\\') + r'\Z',
+        flags)
 
     def assertReEqual(self, a, b):
         # type: (Pattern[Text], Pattern[Text]) -> None
@@ -579,22 +618,19 @@ class GlobsToReTest(unittest.TestCase):
 
     def test_empty(self):
         # type: () -> None
-        self.assertReEqual(
-            re.compile(r'\Z', self.flags), copyright.globs_to_re([]))
+        self.assertReEqual(self.expected_empty, copyright.globs_to_re([]))
 
     def test_star(self):
         # type: () -> None
         pat = copyright.globs_to_re(['*'])
-        self.assertReEqual(re.compile(r'.*\Z', self.flags), pat)
+        self.assertReEqual(self.expected_star, pat)
         self.assertTrue(pat.match('foo'))
         self.assertTrue(pat.match('foo/bar/baz'))
 
     def test_star_prefix(self):
         # type: () -> None
-        e = re.escape
         pat = copyright.globs_to_re(['*.in'])
-        expected = re.compile('.*' + e('.in') + r'\Z', self.flags)
-        self.assertReEqual(expected, pat)
+        self.assertReEqual(self.expected_star_prefix, pat)
         self.assertFalse(pat.match('foo'))
         self.assertFalse(pat.match('in'))
         self.assertTrue(pat.match('Makefile.in'))
@@ -603,10 +639,8 @@ class GlobsToReTest(unittest.TestCase):
 
     def test_star_prefix_with_slash(self):
         # type: () -> None
-        e = re.escape
         pat = copyright.globs_to_re(['*/Makefile.in'])
-        expected = re.compile('.*' + e('/Makefile.in') + r'\Z', self.flags)
-        self.assertReEqual(expected, pat)
+        self.assertReEqual(self.expected_star_prefix_with_slash, pat)
         self.assertFalse(pat.match('foo'))
         self.assertFalse(pat.match('in'))
         self.assertFalse(pat.match('foo/bar/in'))
@@ -615,12 +649,8 @@ class GlobsToReTest(unittest.TestCase):
 
     def test_question_mark(self):
         # type: () -> None
-        e = re.escape
         pat = copyright.globs_to_re(['foo/messages.??_??.txt'])
-        expected = re.compile(
-            e('foo/messages.') + '..' + e('_') + '..' + e('.txt') + r'\Z',
-            self.flags)
-        self.assertReEqual(expected, pat)
+        self.assertReEqual(self.expected_question_mark, pat)
         self.assertFalse(pat.match('messages.en_US.txt'))
         self.assertTrue(pat.match('foo/messages.en_US.txt'))
         self.assertTrue(pat.match('foo/messages.ja_JP.txt'))
@@ -628,11 +658,8 @@ class GlobsToReTest(unittest.TestCase):
 
     def test_multi_literal(self):
         # type: () -> None
-        e = re.escape
         pat = copyright.globs_to_re(['Makefile.in', 'foo/bar'])
-        expected = re.compile(
-            e('Makefile.in') + '|' + e('foo/bar') + r'\Z', self.flags)
-        self.assertReEqual(expected, pat)
+        self.assertReEqual(self.expected_multi_literal, pat)
         self.assertTrue(pat.match('Makefile.in'))
         self.assertFalse(pat.match('foo/Makefile.in'))
         self.assertTrue(pat.match('foo/bar'))
@@ -642,14 +669,9 @@ class GlobsToReTest(unittest.TestCase):
 
     def test_multi_wildcard(self):
         # type: () -> None
-        e = re.escape
         pat = copyright.globs_to_re(
             ['debian/*', '*.Debian', 'translations/fr_??/*'])
-        expected = re.compile(
-            e('debian/') + '.*|.*' + e('.Debian') + '|' +
-            e('translations/fr_') + '..' + e('/') + r'.*\Z',
-            self.flags)
-        self.assertReEqual(expected, pat)
+        self.assertReEqual(self.expected_multi_wildcard, pat)
         self.assertTrue(pat.match('debian/rules'))
         self.assertFalse(pat.match('other/debian/rules'))
         self.assertTrue(pat.match('README.Debian'))
@@ -660,11 +682,8 @@ class GlobsToReTest(unittest.TestCase):
 
     def test_literal_backslash(self):
         # type: () -> None
-        e = re.escape
         pat = copyright.globs_to_re([r'foo/bar\\baz.c', r'bar/quux\\'])
-        expected = re.compile(
-            e(r'foo/bar\baz.c') + '|' + e('bar/quux\\') + r'\Z', self.flags)
-        self.assertReEqual(expected, pat)
+        self.assertReEqual(self.expected_literal_backslash, pat)
 
         self.assertFalse(pat.match('foo/bar.baz.c'))
         self.assertFalse(pat.match('foo/bar/baz.c'))
@@ -672,6 +691,12 @@ class GlobsToReTest(unittest.TestCase):
         self.assertFalse(pat.match('bar/quux'))
         self.assertTrue(pat.match('bar/quux\\'))
 
+    def test_cached(self):
+        # type: () -> None
+        pat = copyright.globs_to_re(['debian/*', '*.Debian'])
+        self.assertIs(pat, copyright.globs_to_re(('debian/*', '*.Debian')))
+        self.assertIsNot(pat, copyright.globs_to_re(['*.Debian', 'debian/*']))
+
     def test_illegal_backslash(self):
         # type: () -> None
         with self.assertRaises(ValueError) as cm:
@@ -687,16 +712,19 @@ class GlobsToReTest(unittest.TestCase):
 
 class FilesParagraphTest(unittest.TestCase):
 
-    def setUp(self):
-        # type: () -> None
-        self.prototype = deb822.Deb822()
-        self.prototype['Files'] = '*'
-        self.prototype['Copyright'] = 'Foo'
-        self.prototype['License'] = 'ISC'
+    def _new_paragraph(self, **fields):
+        # type: (**str) -> copyright.FilesParagraph
+        data = deb822.Deb822()
+        data['Files'] = '*'
+        data['Copyright'] = 'Foo'
+        data['License'] = 'ISC'
+        for name, value in fields.items():
+            data[name] = value
+        return copyright.FilesParagraph(data)
 
     def test_files_property(self):
         # type: () -> None
-        fp = copyright.FilesParagraph(self.prototype)
+        fp = self._new_paragraph()
         self.assertEqual(('*',), fp.files)
 
         fp.files = ['debian/*']   # type: ignore
@@ -710,14 +738,13 @@ class FilesParagraphTest(unittest.TestCase):
         with self.assertRaises(TypeError):
             fp.files = None   # type: ignore
 
-        self.prototype['Files'] = 'foo/*\tbar/*\n\tbaz/*\n quux/*'
-        fp = copyright.FilesParagraph(self.prototype)
+        fp = self._new_paragraph(Files='foo/*\tbar/*\n\tbaz/*\n quux/*')
         self.assertEqual(('foo/*', 'bar/*', 'baz/*', 'quux/*'), fp.files)
 
     def test_license_property(self):
         # type: () -> None
-        fp = copyright.FilesParagraph(self.prototype)
-        self.assertEqual(copyright.License('ISC'), fp.license)
+        fp = self._new_paragraph()
+        self.assertEqual(ISC, fp.license)
         fp.license = copyright.License('ISC', '[LICENSE TEXT]')  # type: ignore
         self.assertEqual(copyright.License('ISC', '[LICENSE TEXT]'), fp.license)
         self.assertEqual('ISC\n [LICENSE TEXT]', fp['license'])
@@ -727,7 +754,7 @@ class FilesParagraphTest(unittest.TestCase):
 
     def test_matches(self):
         # type: () -> None
-        fp = copyright.FilesParagraph(self.prototype)
+        fp = self._new_paragraph()
         self.assertTrue(fp.matches('foo/bar.cc'))
         self.assertTrue(fp.matches('Makefile'))
         self.assertTrue(fp.matches('debian/rules'))
@@ -742,15 +769,26 @@ class FilesParagraphTest(unittest.TestCase):
         self.assertTrue(fp.matches('Makefile'))
         self.assertFalse(fp.matches('debian/rules'))
 
+    def test_matches_many_globs(self):
+        # type: () -> None
+        globs = ['src/mod%d/*' % i for i in range(50)]
+        fp = self._new_paragraph(Files=' '.join(globs))
+        self.assertEqual(tuple(globs), fp.files)
+        for i in (0, 25, 49):
+            with self.subTest(i=i):
+                self.assertTrue(fp.matches('src/mod%d/foo.c' % i))
+        self.assertFalse(fp.matches('src/mod50/foo.c'))
+        self.assertFalse(fp.matches('src/foo.c'))
+
     def test_create(self):
         # type: () -> None
         fp = copyright.FilesParagraph.create(
             files=['Makefile', 'foo/*'],
             copyright='Copyright 2014 Some Guy',
-            license=copyright.License('ISC'))
+            license=ISC)
         self.assertEqual(('Makefile', 'foo/*'), fp.files)
         self.assertEqual('Copyright 2014 Some Guy', fp.copyright)
-        self.assertEqual(copyright.License('ISC'), fp.license)
+        self.assertEqual(ISC, fp.license)
 
         with self.assertRaises(TypeError):
             copyright.FilesParagraph.create(
@@ -758,11 +796,11 @@ class FilesParagraphTest(unittest.TestCase):
 
         with self.assertRaises(TypeError):
             copyright.FilesParagraph.create(
-                files=['*'], copyright=None, license=copyright.License('ISC'))
+                files=['*'], copyright=None, license=ISC)
 
         with self.assertRaises(TypeError):
             copyright.FilesParagraph.create(
-                files=None, copyright='foo', license=copyright.License('ISC'))
+                files=None, copyright='foo', license=ISC)
 
 
 class HeaderTest(unittest.TestCase):
@@ -800,52 +838,39 @@ class HeaderTest(unittest.TestCase):
             h.upstream_name = 'Foo Bar\n Baz'   # type: ignore
         self.assertEqual(('must be single line',), cm.exception.args)
 
-    def test_upstream_contact_single_read(self):
-        # type: () -> None
-        data = deb822.Deb822()
-        data['Format'] = FORMAT
-        data['Upstream-Contact'] = 'Foo Bar <foo@bar.com>'
-        h = copyright.Header(data=data)
-        self.assertEqual(('Foo Bar <foo@bar.com>',), h.upstream_contact)
-
-    def test_upstream_contact_multi1_read(self):
-        # type: () -> None
-        data = deb822.Deb822()
-        data['Format'] = FORMAT
-        data['Upstream-Contact'] = 'Foo Bar <foo@bar.com>\n http://bar.com/foo'
-        h = copyright.Header(data=data)
-        self.assertEqual(
-            ('Foo Bar <foo@bar.com>', 'http://bar.com/foo'),
-            h.upstream_contact)
-
-    def test_upstream_contact_multi2_read(self):
-        # type: () -> None
-        data = deb822.Deb822()
-        data['Format'] = FORMAT
-        data['Upstream-Contact'] = (
-            '\n Foo Bar <foo@bar.com>\n http://bar.com/foo')
-        h = copyright.Header(data=data)
-        self.assertEqual(
-            ('Foo Bar <foo@bar.com>', 'http://bar.com/foo'),
-            h.upstream_contact)
-
-    def test_upstream_contact_single_write(self):
-        # type: () -> None
+    def test_upstream_contact_read(self):
+        # type: () -> None
+        cases = [
+            ('Foo Bar <foo@bar.com>', ('Foo Bar <foo@bar.com>',)),
+            ('Foo Bar <foo@bar.com>\n http://bar.com/foo',
+             ('Foo Bar <foo@bar.com>', 'http://bar.com/foo')),
+            ('\n Foo Bar <foo@bar.com>\n http://bar.com/foo',
+             ('Foo Bar <foo@bar.com>', 'http://bar.com/foo')),
+        ]
+        for contact, expected in cases:
+            with self.subTest(contact=contact):
+                data = deb822.Deb822()
+                data['Format'] = FORMAT
+                data['Upstream-Contact'] = contact
+                h = copyright.Header(data=data)
+                self.assertEqual(expected, h.upstream_contact)
+
+    def test_upstream_contact_write(self):
+        # type: () -> None
+        # The raw value is read back with both spellings of the field name
+        cases = [
+            (['Foo Bar <foo@bar.com>'],
+             'Upstream-Contact', 'Foo Bar <foo@bar.com>'),
+            (['Foo Bar <foo@bar.com>', 'http://bar.com/foo'],
+             'upstream-contact', '\n Foo Bar <foo@bar.com>\n http://bar.com/foo'),
+        ]
+        # Each assignment replaces the previous value, so one Header will do.
         h = copyright.Header()
-        h.upstream_contact = ['Foo Bar <foo@bar.com>']   # type: ignore
-        self.assertEqual(('Foo Bar <foo@bar.com>',), h.upstream_contact)
-        self.assertEqual('Foo Bar <foo@bar.com>', h['Upstream-Contact'])
-
-    def test_upstream_contact_multi_write(self):
-        # type: () -> None
-        h = copyright.Header()
-        h.upstream_contact = ['Foo Bar <foo@bar.com>', 'http://bar.com/foo']   # type: ignore
-        self.assertEqual(
-            ('Foo Bar <foo@bar.com>', 'http://bar.com/foo'),
-            h.upstream_contact)
-        self.assertEqual(
-            '\n Foo Bar <foo@bar.com>\n http://bar.com/foo',
-            h['upstream-contact'])
+        for value, key, raw in cases:
+            with self.subTest(value=value):
+                h.upstream_contact = value   # type: ignore
+                self.assertEqual(tuple(value), h.upstream_contact)
+                self.assertEqual(raw, h[key])
 
     def test_license(self):
         # type: () -> None
@@ -18,10 +18,12 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
 import email.utils
+import functools
 import io
 import os
 import os.path
 import pickle
+import random
 import re
 import subprocess
 import sys
@@ -29,6 +31,7 @@ import tempfile
 import textwrap
 import unittest
 import warnings
+from string import ascii_letters, digits
 
 try:
     # skip tests that require apt_pkg if it is not available
@@ -37,6 +40,7 @@ try:
 except (ImportError, AttributeError):
     _have_apt_pkg = False
 
+from debian import _util
 from debian import deb822
 from debian.debian_support import Version
 
@@ -103,7 +107,8 @@ Description: text-based mailreader supporting MIME, GPG, PGP and threading
 Tag: interface::text-mode, made-of::lang:c, mail::imap, mail::pop, mail::user-agent, protocol::imap, protocol::ipv6, protocol::pop, protocol::ssl, role::sw:client, uitoolkit::ncurses, use::editing, works-with::mail
 Task: mail-server
 '''
-        
+
+UNPARSED_PACKAGE_LINES = tuple(UNPARSED_PACKAGE.splitlines())
 
 PARSED_PACKAGE = deb822.Deb822Dict([
     ('Package', 'mutt'),
@@ -330,6 +335,26 @@ def open_utf8(filename, mode='r'):
     return open(filename, mode=mode, encoding='UTF-8')
 
 
+# Trailing whitespace and the line break that follows it (the same line breaks
+# and whitespace as bytes.splitlines() and bytes.rstrip())
+TRAILING_WHITESPACE_RE = re.compile(rb'[ \t\x0b\x0c]*(?:\r\n|\r|\n)')
+
+
+@functools.lru_cache(maxsize=None)
+def read_rstripped_bytes(filename):
+    # type: (str) -> bytes
+    """Return the file's contents with trailing whitespace stripped per line.
+
+    Line breaks are normalised to "\\n" and the result ends with one.  It is
+    cached, since several tests compare against the same file.
+    """
+    with open(filename, 'rb') as fh:
+        content = TRAILING_WHITESPACE_RE.sub(b"\n", fh.read())
+    if content and not content.endswith(b"\n"):
+        content = content.rstrip(b" \t\x0b\x0c") + b"\n"
+    return content
+
+
 class TestDeb822Dict(unittest.TestCase):
     def make_dict(self):
         # type: () -> deb822.Deb822Dict
@@ -392,6 +417,52 @@ class TestDeb822Dict(unittest.TestCase):
         d = self.make_dict()
         self.assertEqual(1, d['testkey'])
 
+    def test_cached_key_case_per_dict(self):
+        # type: () -> None
+        # Both spellings share a cache but each dict keeps its own
+        d1 = deb822.Deb822Dict()
+        d1['Foo-Bar'] = '1'
+        d2 = deb822.Deb822Dict()
+        d2['foo-bar'] = '2'
+        self.assertEqual(['Foo-Bar'], list(d1.keys()))
+        self.assertEqual(['foo-bar'], list(d2.keys()))
+        self.assertEqual('1', d1['FOO-BAR'])
+        self.assertEqual('2', d2['FOO-BAR'])
+
+    def test_cached_key_cache_limit(self):
+        # type: () -> None
+        _util._strI_cache.clear()
+        self.addCleanup(_util._strI_cache.clear)
+        first = _util._cached_strI('Field-0')
+        self.assertIs(first, _util._cached_strI('Field-0'))
+        for i in range(1, _util._STRI_CACHE_SIZE):
+            _util._cached_strI('Field-%d' % i)
+        self.assertEqual(_util._STRI_CACHE_SIZE, len(_util._strI_cache))
+
+        # A full cache is emptied before the next new spelling is added
+        _util._cached_strI('One-More')
+        self.assertEqual(['One-More'], list(_util._strI_cache))
+        self.assertIsNot(first, _util._cached_strI('Field-0'))
+
+    def test_cached_key_str_subclass(self):
+        # type: () -> None
+        # Only exact str keys go through the cache
+        _util._strI_cache.clear()
+        key = _util._strI('Foo')
+        result = _util._cached_strI(key)
+        self.assertEqual('foo', result)
+        self.assertEqual({}, _util._strI_cache)
+        self.assertIsNot(result, _util._cached_strI(key))
+
+
+RANDOM_STRING_CHARS = ascii_letters + digits
+
+# A "Field:" line that ends in whitespace
+FIELD_TRAILING_SPACE_RE = re.compile(r"^\S+:\s+$")
+# Any "Field:" line, and one with a space before its value
+FIELD_RE = re.compile(r"^\S+:")
+FIELD_WITH_SPACE_RE = re.compile(r"^\S+: ")
+
 
 class TestDeb822(unittest.TestCase):
     def assertWellParsed(self, deb822_, dict_):
@@ -401,22 +472,20 @@ class TestDeb822(unittest.TestCase):
         """
 
         self.assertEqual(deb822_.keys(), dict_.keys())
-
-        for k, v in dict_.items():
-            self.assertEqual(v, deb822_[k])
+        # Compare all values at once; on failure this also shows a diff.
+        self.assertEqual(dict(dict_), dict(deb822_))
         self.assertEqual(deb822_, dict_)
 
     @staticmethod
     def gen_random_string(length=20):
         # type: (int) -> str
-        from random import choice
-        import string
-        chars = string.ascii_letters + string.digits
-        return ''.join([choice(chars) for i in range(length)])
+        # random.choices() would do this in one call, but needs Python 3.6
+        return ''.join([random.choice(RANDOM_STRING_CHARS)
+                        for _ in range(length)])
 
     def test_parser(self):
         # type: () -> None
-        deb822_ = deb822.Deb822(UNPARSED_PACKAGE.splitlines())
+        deb822_ = deb822.Deb822(UNPARSED_PACKAGE_LINES)
         self.assertWellParsed(deb822_, PARSED_PACKAGE)
 
     def test_pickling(self):
@@ -456,12 +525,12 @@ with open("test_deb822.pickle", "wb") as fh:
 
     def test_parser_with_newlines(self):
         # type: () -> None
-        deb822_ = deb822.Deb822([ l+'\n' for l in UNPARSED_PACKAGE.splitlines()])
+        deb822_ = deb822.Deb822([ l+'\n' for l in UNPARSED_PACKAGE_LINES])
         self.assertWellParsed(deb822_, PARSED_PACKAGE)
 
     def test_strip_initial_blanklines(self):
         # type: () -> None
-        deb822_ = deb822.Deb822(['\n'] * 3 + UNPARSED_PACKAGE.splitlines())
+        deb822_ = deb822.Deb822(['\n'] * 3 + list(UNPARSED_PACKAGE_LINES))
         self.assertWellParsed(deb822_, PARSED_PACKAGE)
 
     def test_reorder(self):
@@ -712,15 +781,10 @@ with open("test_deb822.pickle", "wb") as fh:
             text = UNPARSED_PACKAGE + '%s\n' % extra_space + \
                         UNPARSED_PACKAGE
 
-            fd, filename = tempfile.mkstemp()
-            fp = os.fdopen(fd, 'wb')
-            fp.write(text.encode('utf-8'))
-            fp.close()
-
-            try:
-                tests(filename)
-            finally:
-                os.remove(filename)
+            with tempfile.NamedTemporaryFile() as fh:
+                fh.write(text.encode('utf-8'))
+                fh.flush()
+                tests(fh.name)
 
     def test_iter_paragraphs_with_extra_whitespace_default(self):
         # type: () -> None
@@ -772,23 +836,18 @@ with open("test_deb822.pickle", "wb") as fh:
     def _test_iter_paragraphs(self, filename, cls, **kwargs):
         # type: (str, Type[deb822.Deb822], **Any) -> None
         """Ensure iter_paragraphs consistency"""
-        
-        with open(filename, 'rb') as fh:
-            packages_content = fh.read()
 
         # XXX: The way multivalued fields parsing works, we can't guarantee
         # that trailing whitespace is reproduced.
-        packages_content = b"\n".join([line.rstrip() for line in
-                                       packages_content.splitlines()] + [b''])
+        packages_content = read_rstripped_bytes(filename)
 
         s = io.BytesIO()
         l = []
-        f = open_utf8(filename)
-        for p in cls.iter_paragraphs(f, **kwargs):
-            p.dump(s)
-            s.write(b"\n")
-            l.append(p)
-        f.close()
+        with open_utf8(filename) as f:
+            for p in cls.iter_paragraphs(f, **kwargs):
+                p.dump(s)
+                s.write(b"\n")
+                l.append(p)
         self.assertEqual(s.getvalue(), packages_content)
         if kwargs["shared_storage"] is False:
             # If shared_storage is False, data should be consistent across
@@ -838,12 +897,13 @@ with open("test_deb822.pickle", "wb") as fh:
     def test_iter_paragraphs_empty_input(self):
         # type: () -> None
         generator = deb822.Deb822.iter_paragraphs([])
-        self.assertRaises(StopIteration, next, generator)
+        sentinel = object()
+        self.assertIs(sentinel, next(generator, sentinel))
 
     def test_parser_limit_fields(self):
         # type: () -> None
         wanted_fields = [ 'Package', 'MD5sum', 'Filename', 'Description' ]
-        deb822_ = deb822.Deb822(UNPARSED_PACKAGE.splitlines(), wanted_fields)
+        deb822_ = deb822.Deb822(UNPARSED_PACKAGE_LINES, wanted_fields)
 
         self.assertEqual(sorted(wanted_fields), sorted(deb822_.keys()))
 
@@ -855,7 +915,7 @@ with open("test_deb822.pickle", "wb") as fh:
         wanted_fields = [ 'Package', 'MD5sum', 'Filename', 'Tag' ]
 
         for deb822_ in deb822.Deb822.iter_paragraphs(
-                UNPARSED_PACKAGE.splitlines(), wanted_fields):
+                UNPARSED_PACKAGE_LINES, wanted_fields):
 
             self.assertEqual(sorted(wanted_fields), sorted(deb822_.keys()))
 
@@ -876,7 +936,7 @@ with open("test_deb822.pickle", "wb") as fh:
 
     def test__delitem__(self):
         # type: () -> None
-        parsed = deb822.Deb822(UNPARSED_PACKAGE.splitlines())
+        parsed = deb822.Deb822(UNPARSED_PACKAGE_LINES)
         deriv = deb822.Deb822(_parsed=parsed)
         dict_ = PARSED_PACKAGE.copy()
 
@@ -940,14 +1000,11 @@ with open("test_deb822.pickle", "wb") as fh:
         with a newline (e.g. the control file Description field), then there
         should be a space after the colon, as with non-multiline fields.
         """
-        
-        # bad_re: match a line that starts with a "Field:", and ends in
-        # whitespace
-        bad_re = re.compile(r"^\S+:\s+$")
+
         for cls in deb822.Deb822, deb822.Changes:
             parsed = cls(CHANGES_FILE.splitlines())
             for line in parsed.dump().splitlines():
-                self.assertTrue(bad_re.match(line) is None,
+                self.assertTrue(FIELD_TRAILING_SPACE_RE.match(line) is None,
                                 "There should not be trailing whitespace "
                                 "after the colon in a multiline field "
                                 "starting with a newline")
@@ -971,13 +1028,11 @@ Description: python modules to work with Debian-related data formats
     (debian_bundle.deb822 module)
 """
         parsed_control = deb822.Deb822(control_paragraph.splitlines())
-        field_re = re.compile(r"^\S+:")
-        field_with_space_re = re.compile(r"^\S+: ")
         dump = parsed_control.dump()
         self.assertIsNotNone(dump)
         for line in dump.splitlines():
-            if field_re.match(line):
-                self.assertTrue(field_with_space_re.match(line),
+            if FIELD_RE.match(line):
+                self.assertTrue(FIELD_WITH_SPACE_RE.match(line),
                                 "Multiline fields that do not start with "
                                 "newline should have a space between the "
                                 "colon and the beginning of the value")
@@ -1092,9 +1147,8 @@ Description: python modules to work with Debian-related data formats
                 fb, encoding='iso8859-1'))
 
         # dump() with no fd returns a unicode object - both should be identical
-        self.assertEqual(len(utf8), len(latin1))
-        for i in range(len(utf8)):
-            self.assertEqual(utf8[i].dump(), latin1[i].dump())
+        self.assertEqual([d.dump() for d in utf8],
+                         [d.dump() for d in latin1])
 
         # XXX: The way multiline fields parsing works, we can't guarantee
         # that trailing whitespace is reproduced.
@@ -1608,12 +1662,12 @@ class TestVersionAccessor(unittest.TestCase):
     def test_get_version(self):
         # type: () -> None
         # should not be available in most basic Deb822
-        p = deb822.Deb822(UNPARSED_PACKAGE.splitlines())
+        p = deb822.Deb822(UNPARSED_PACKAGE_LINES)
         with self.assertRaises(AttributeError):
             p.get_version()    # type: ignore
 
         # should be available in Packages
-        p = deb822.Packages(UNPARSED_PACKAGE.splitlines())
+        p = deb822.Packages(UNPARSED_PACKAGE_LINES)
         v = p.get_version()
         self.assertEqual(str(v), '1.5.12-1')
         self.assertTrue(isinstance(v, Version))
@@ -1621,12 +1675,12 @@ class TestVersionAccessor(unittest.TestCase):
     def test_set_version(self):
         # type: () -> None
         # should not be available in most basic Deb822
-        p = deb822.Deb822(UNPARSED_PACKAGE.splitlines())
+        p = deb822.Deb822(UNPARSED_PACKAGE_LINES)
         with self.assertRaises(AttributeError):
             p.set_version()   # type: ignore
 
         # should be available in Packages
-        p = deb822.Packages(UNPARSED_PACKAGE.splitlines())
+        p = deb822.Packages(UNPARSED_PACKAGE_LINES)
         newver = '9.8.7-1'
         v = Version(newver)
         p.set_version(v)
@@ -1695,10 +1749,13 @@ class TestGpgInfo(unittest.TestCase):
         self._validate_gpg_info(gpg_info)
 
 
+_WHITESPACE_RE = re.compile(r'\s')
+
+
 def _no_space(s):
     # type: (str) -> str
     """Returns s.  Raises ValueError if s contains any whitespace."""
-    if re.search(r'\s', s):
+    if _WHITESPACE_RE.search(s):
         raise ValueError('whitespace not allowed')
     return s
 